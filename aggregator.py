@@ -1,21 +1,23 @@
 import streamlit as st
-import runpy
+import uniswap_app
+import put_option_app
+import lp_plus_put_app
 
 def main():
     st.title("Single-Page Aggregator: Uniswap LP + Put Option + Combined Hedge")
 
     st.subheader("1) Uniswap V3 LP Value App")
-    runpy.run_path("uniswap_app.py", run_name="__main__")
+    uniswap_app.main()
 
     st.write("---")
 
     st.subheader("2) Put Option P/L App")
-    runpy.run_path("put_option_app.py", run_name="__main__")
+    put_option_app.main()
 
     st.write("---")
 
     st.subheader("3) Combined LP + Put (Auto-Uses Previous Inputs)")
-    runpy.run_path("lp_plus_put_app.py", run_name="__main__")
+    lp_plus_put_app.main()
 
 if __name__ == "__main__":
     main()
@@ -1,47 +1,42 @@
 import streamlit as st
-import numpy as np
-import math
-import matplotlib.pyplot as plt
-from math import log, sqrt
-from statistics import NormalDist
+from plot_grid import N_PLOT, price_grid
+from put_option_math import SQRT_365_OVER_180, bs_put_pnl, bs_put_price, position_sign
+from uniswap_math import uniswap_lp_constants, uniswap_lp_value, uniswap_v3_value_unit_sorted
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
 
 ###############################################################################
-# 1) Uniswap logic (same as uniswap_app.py)
+# 1) Price sweep
 ###############################################################################
-def uniswap_v3_value_unit(S, K, r):
-    if S < (K / r):
-        return S
-    elif S > (K * r):
-        return K
-    else:
-        return (2.0 * math.sqrt(S * K * r) - S - K) / (r - 1.0)
-
-def uniswap_lp_value(S, S0, t_L, t_H, V0):
-    K = math.sqrt(t_L * t_H)
-    r = math.sqrt(t_H / t_L)
-    value_unit_at_S0 = uniswap_v3_value_unit(S0, K, r)
-    if value_unit_at_S0 == 0:
-        return 0.0
-    alpha = V0 / value_unit_at_S0
-    return alpha * uniswap_v3_value_unit(S, K, r)
+@st.cache_data
+def combined_curves(K, r, alpha, strike, T_years, sigma_annual, premium, quantity,
+                    position_type, price_min, price_max, n_points=N_PLOT):
+    S_values = price_grid(price_min, price_max, n_points, kinks=(K / r, K * r, strike))
+    lp_vals = uniswap_v3_value_unit_sorted(S_values, K, r)
+    lp_vals *= alpha
+    put_vals = bs_put_price(S_values, strike, T_years, sigma_annual)
+    put_vals -= premium
+    put_vals *= position_sign(position_type) * quantity
+    combined_vals = lp_vals + put_vals
+    return S_values, lp_vals, put_vals, combined_vals
 
 ###############################################################################
-# 2) Black–Scholes put + PNL (same as put_option_app.py)
+# 2) Specific-price readout
 ###############################################################################
-def bs_put_price(S, K, T, sigma_annual):
-    if T <= 1e-10:
-        return max(K - S, 0.0)
-    d1 = (log(S/K) + 0.5*sigma_annual**2*T) / (sigma_annual*math.sqrt(T))
-    d2 = d1 - sigma_annual*math.sqrt(T)
-    N = NormalDist(0,1).cdf
-    return K*N(-d2) - S*N(-d1)
-
-def bs_put_pnl(S, K, T, sigma_annual, premium, quantity, position_type):
-    val = bs_put_price(S, K, T, sigma_annual)
-    if position_type == "Buy":
-        return (val - premium) * quantity
-    else:
-        return (premium - val) * quantity
+@st.fragment
+def specific_price_readout(K, r, alpha, strike, T_years, sigma_annual, premium, quantity,
+                           position_type, price_min, price_max, S0):
+    st.markdown("### Calculate Combined Value at a Specific Token Price")
+    specific_price = st.number_input("Enter Token Price (USD) to Evaluate Combined Value:",
+                                     key="specific_price",
+                                     min_value=price_min,
+                                     max_value=price_max,
+                                     value=S0,
+                                     step=1.0)
+    combined_value_at_price = uniswap_lp_value(specific_price, K, r, alpha) + \
+                              bs_put_pnl(specific_price, strike, T_years, sigma_annual, premium, quantity, position_type)
+    st.write(f"At a token price of **${specific_price:.2f}**, the combined total value is **${combined_value_at_price:.2f}**.")
 
 ###############################################################################
 # 3) MAIN: Combined LP + Put (Black–Scholes) with Extra ETH Price Input
@@ -91,11 +86,7 @@ def main():
     T_years = T_months / 12.0
 
     user_iv_180 = st.session_state["put_sigma_180"]
-    days_180 = 180.0 / 365.0
-    if days_180 < 1e-10:
-        st.error("Cannot compute annual volatility from 180 days.")
-        return
-    sigma_annual = user_iv_180 / math.sqrt(days_180)
+    sigma_annual = user_iv_180 * SQRT_365_OVER_180
 
     put_min = st.session_state["put_price_min_bs"]
     put_max = st.session_state["put_price_max_bs"]
@@ -107,17 +98,15 @@ def main():
         st.error("Combined: price_min >= price_max. Adjust in Uniswap/Put sections.")
         return
 
-    S_values = np.linspace(price_min, price_max, 300)
-    lp_vals = []
-    put_vals = []
-    combined_vals = []
+    if t_L >= t_H:
+        st.error("Combined: t_L must be strictly less than t_H. Adjust in the Uniswap section.")
+        return
 
-    for S in S_values:
-        lp_v = uniswap_lp_value(S, S0, t_L, t_H, V0)
-        put_pnl_val = bs_put_pnl(S, strike, T_years, sigma_annual, premium, quantity, position_type)
-        lp_vals.append(lp_v)
-        put_vals.append(put_pnl_val)
-        combined_vals.append(lp_v + put_pnl_val)
+    K, r, alpha = uniswap_lp_constants(S0, t_L, t_H, V0)
+
+    S_values, lp_vals, put_vals, combined_vals = combined_curves(
+        K, r, alpha, strike, T_years, sigma_annual, premium, quantity, position_type,
+        price_min, price_max)
 
     fig, ax = plt.subplots(figsize=(8, 5))
     ax.plot(S_values, lp_vals, label="LP Value", color="blue")
@@ -133,18 +122,11 @@ def main():
     ax.legend()
 
     st.pyplot(fig)
+    plt.close(fig)
 
     # 4) Extra: Specific Token Price Value Calculation
-    st.markdown("### Calculate Combined Value at a Specific Token Price")
-    specific_price = st.number_input("Enter Token Price (USD) to Evaluate Combined Value:",
-                                     key="specific_price",
-                                     min_value=price_min,
-                                     max_value=price_max,
-                                     value=S0,
-                                     step=1.0)
-    combined_value_at_price = uniswap_lp_value(specific_price, S0, t_L, t_H, V0) + \
-                              bs_put_pnl(specific_price, strike, T_years, sigma_annual, premium, quantity, position_type)
-    st.write(f"At a token price of **${specific_price:.2f}**, the combined total value is **${combined_value_at_price:.2f}**.")
+    specific_price_readout(K, r, alpha, strike, T_years, sigma_annual, premium, quantity,
+                           position_type, price_min, price_max, S0)
 
 if __name__ == "__main__":
     main()
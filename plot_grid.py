@@ -0,0 +1,11 @@
+import numpy as np
+
+###############################################################################
+# Price-axis grid shared by the plotting apps
+###############################################################################
+N_PLOT = 150
+
+def price_grid(price_min, price_max, n_points, kinks=()):
+    grid = np.linspace(price_min, price_max, n_points)
+    kinks = np.asarray([k for k in kinks if price_min < k < price_max], dtype=float)
+    return np.union1d(grid, kinks)
@@ -1,30 +1,28 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-import math
-from math import log, sqrt
-from statistics import NormalDist
-
-###############################################################################
-# Black–Scholes functions (r=0 for simplicity, no dividends)
-###############################################################################
-def bs_put_price(S, K, T, sigma_annual):
-    if T <= 1e-10:
-        return max(K - S, 0.0)
-
-    d1 = (math.log(S/K) + 0.5 * sigma_annual**2 * T) / (sigma_annual * math.sqrt(T))
-    d2 = d1 - sigma_annual * math.sqrt(T)
-    N = NormalDist(0, 1).cdf
-    put_value = K * N(-d2) - S * N(-d1)
-    return put_value
-
-def bs_put_delta(S, K, T, sigma_annual):
-    if T <= 1e-10:
-        return -1.0 if S < K else 0.0
-
-    d1 = (math.log(S/K) + 0.5 * sigma_annual**2 * T) / (sigma_annual * math.sqrt(T))
-    N = NormalDist(0, 1).cdf
-    return N(d1) - 1.0
+from plot_grid import N_PLOT, price_grid
+from put_option_math import SQRT_365_OVER_180, bs_put_price_and_delta, position_sign
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+@st.cache_data
+def put_bs_curves(strike, T_years, sigma_annual, S_min, S_max, n_points=N_PLOT):
+    prices = price_grid(S_min, S_max, n_points, kinks=(strike,))
+
+    intrinsic_vals = np.subtract(strike, prices)
+    np.maximum(intrinsic_vals, 0.0, out=intrinsic_vals)
+    bs_vals, deltas = bs_put_price_and_delta(prices, strike, T_years, sigma_annual)
+    return prices, intrinsic_vals, bs_vals, deltas
+
+def put_curves(strike, premium, quantity, position_type, T_years, sigma_annual,
+               S_min, S_max, n_points=N_PLOT):
+    prices, intrinsic_vals, bs_vals, deltas = put_bs_curves(
+        strike, T_years, sigma_annual, S_min, S_max, n_points)
+
+    pnl_vals = bs_vals - premium
+    pnl_vals *= position_sign(position_type) * quantity
+    return prices, intrinsic_vals, bs_vals, pnl_vals, deltas
 
 def main():
     st.title("Put Option: Intrinsic Value, Theoretical Value, PNL, and Delta (Months + 180d Vol)")
@@ -42,84 +40,66 @@ def main():
     - Implied Vol for a **180-day horizon** (converted to annual vol)
     """)
 
-    st.sidebar.header("Option Parameters")
-    strike = st.sidebar.number_input("Strike Price (K)",
-                                     key="put_strike_bs",
-                                     value=2100.0,
-                                     step=1.0,
-                                     min_value=0.01)
-    premium = st.sidebar.number_input("Premium you paid/received",
-                                      key="put_premium_bs",
-                                      value=187.0,
-                                      step=1.0,
+    with st.sidebar.form("put_inputs"):
+        st.header("Option Parameters")
+        strike = st.number_input("Strike Price (K)",
+                                 key="put_strike_bs",
+                                 value=2100.0,
+                                 step=1.0,
+                                 min_value=0.01)
+        premium = st.number_input("Premium you paid/received",
+                                  key="put_premium_bs",
+                                  value=187.0,
+                                  step=1.0,
+                                  min_value=0.0)
+        quantity = st.number_input("Quantity (contracts)",
+                                   key="put_qty_bs",
+                                   value=1.0,
+                                   step=1.0,
+                                   min_value=1.0)
+        position_type = st.selectbox("Position Type",
+                                     ("Buy", "Sell"),
+                                     key="put_position_type_bs",
+                                     index=0)
+
+        st.header("Market / Expiry Inputs")
+        T_months = st.number_input("Time to Expiration (months)",
+                                   key="put_T_months",
+                                   value=1.0,
+                                   step=1.0,
+                                   min_value=0.0)
+
+        st.markdown("**Implied Vol (180-day horizon)**")
+        user_iv_180 = st.number_input("Implied Vol (180-day horizon)",
+                                      key="put_sigma_180",
+                                      value=0.65,
+                                      step=0.01,
                                       min_value=0.0)
-    quantity = st.sidebar.number_input("Quantity (contracts)",
-                                       key="put_qty_bs",
-                                       value=1.0,
-                                       step=1.0,
-                                       min_value=1.0)
-    position_type = st.sidebar.selectbox("Position Type",
-                                         ("Buy", "Sell"),
-                                         key="put_position_type_bs",
-                                         index=0)
-
-    st.sidebar.header("Market / Expiry Inputs")
-    T_months = st.sidebar.number_input("Time to Expiration (months)",
-                                       key="put_T_months",
-                                       value=1.0,
-                                       step=1.0,
-                                       min_value=0.0)
+
+        st.subheader("Plot Range for Underlying Price")
+        S_min = st.number_input("Min Token Price (USD)",
+                                key="put_price_min_bs",
+                                min_value=0.01,
+                                value=500.0,
+                                step=1.0)
+        S_max = st.number_input("Max Token Price (USD)",
+                                key="put_price_max_bs",
+                                min_value=0.01,
+                                value=4000.0,
+                                step=1.0)
+
+        st.form_submit_button("Update")
+
     T_years = T_months / 12.0
 
-    st.sidebar.markdown("**Implied Vol (180-day horizon)**")
-    user_iv_180 = st.sidebar.number_input("Implied Vol (180-day horizon)",
-                                          key="put_sigma_180",
-                                          value=0.65,
-                                          step=0.01,
-                                          min_value=0.0)
-    days_180 = 180.0 / 365.0
-    if days_180 < 1e-10:
-        st.error("Vol cannot be computed for 180 days.")
-        return
-    sigma_annual = user_iv_180 / math.sqrt(days_180)
-
-    st.sidebar.subheader("Plot Range for Underlying Price")
-    S_min = st.sidebar.number_input("Min Token Price (USD)",
-                                    key="put_price_min_bs",
-                                    min_value=0.01,
-                                    value=500.0,
-                                    step=1.0)
-    S_max = st.sidebar.number_input("Max Token Price (USD)",
-                                    key="put_price_max_bs",
-                                    min_value=0.01,
-                                    value=4000.0,
-                                    step=1.0)
+    sigma_annual = user_iv_180 * SQRT_365_OVER_180
 
     if S_min >= S_max:
         st.error("Min price must be strictly less than Max price.")
         return
 
-    prices = np.linspace(S_min, S_max, 300)
-
-    intrinsic_vals = []
-    bs_vals = []
-    pnl_vals = []
-    deltas = []
-
-    for S in prices:
-        intrinsic = max(strike - S, 0.0)
-        bs_val = bs_put_price(S, strike, T_years, sigma_annual)
-        delta = bs_put_delta(S, strike, T_years, sigma_annual)
-
-        if position_type == "Buy":
-            pl = (bs_val - premium) * quantity
-        else:
-            pl = (premium - bs_val) * quantity
-
-        intrinsic_vals.append(intrinsic)
-        bs_vals.append(bs_val)
-        pnl_vals.append(pl)
-        deltas.append(delta)
+    prices, intrinsic_vals, bs_vals, pnl_vals, deltas = put_curves(
+        strike, premium, quantity, position_type, T_years, sigma_annual, S_min, S_max)
 
     fig, ax1 = plt.subplots(figsize=(8, 5))
     ax1.plot(prices, intrinsic_vals, label="Intrinsic Value", linestyle="--")
@@ -142,6 +122,7 @@ def main():
     ax1.legend(lines1 + lines2, labels1 + labels2, loc="best")
 
     st.pyplot(fig)
+    plt.close(fig)
 
 if __name__ == "__main__":
     main()
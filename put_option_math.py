@@ -0,0 +1,44 @@
+import numpy as np
+import math
+from scipy.special import ndtr
+
+###############################################################################
+# Black–Scholes put math (r=0 for simplicity, no dividends) shared by
+# put_option_app.py and lp_plus_put_app.py
+###############################################################################
+_INV_SQRT2 = 1.0 / math.sqrt(2.0)
+SQRT_365_OVER_180 = math.sqrt(365.0 / 180.0)
+
+def _norm_cdf(x):
+    return 0.5 * math.erfc(-x * _INV_SQRT2)
+
+def bs_put_price(S, K, T, sigma_annual):
+    if T <= 1e-10 or sigma_annual <= 1e-10:
+        return np.maximum(K - S, 0.0)
+
+    if np.ndim(S) == 0:
+        sigma_sqrt_T = sigma_annual * math.sqrt(T)
+        neg_d1 = (math.log(K / S) - 0.5 * sigma_annual * sigma_annual * T) / sigma_sqrt_T
+        return K * _norm_cdf(neg_d1 + sigma_sqrt_T) - S * _norm_cdf(neg_d1)
+
+    return bs_put_price_and_delta(S, K, T, sigma_annual)[0]
+
+def bs_put_price_and_delta(S, K, T, sigma_annual):
+    if T <= 1e-10 or sigma_annual <= 1e-10:
+        return np.maximum(K - S, 0.0), np.where(S < K, -1.0, 0.0)
+
+    sigma_sqrt_T = sigma_annual * math.sqrt(T)
+    neg_d1 = np.log(K / S)
+    neg_d1 -= 0.5 * sigma_annual * sigma_annual * T
+    neg_d1 /= sigma_sqrt_T
+    cdf_neg_d1, cdf_neg_d2 = ndtr(np.stack((neg_d1, neg_d1 + sigma_sqrt_T)))
+    put_value = K * cdf_neg_d2
+    put_value -= S * cdf_neg_d1
+    return put_value, np.negative(cdf_neg_d1)
+
+def position_sign(position_type):
+    return 1.0 if position_type == "Buy" else -1.0
+
+def bs_put_pnl(S, K, T, sigma_annual, premium, quantity, position_type):
+    val = bs_put_price(S, K, T, sigma_annual)
+    return position_sign(position_type) * (val - premium) * quantity
@@ -1,47 +1,28 @@
 import streamlit as st
-import numpy as np
-import math
-import matplotlib.pyplot as plt
-
-def uniswap_v3_value_unit(S, K, r):
-    if S < (K / r):
-        return S
-    elif S > (K * r):
-        return K
-    else:
-        return (2.0 * math.sqrt(S * K * r) - S - K) / (r - 1.0)
-
-def plot_uniswap_v3_lp_value(S0, t_L, t_H, V0):
-    K = math.sqrt(t_L * t_H)
-    r = math.sqrt(t_H / t_L)
-    value_unit_at_S0 = uniswap_v3_value_unit(S0, K, r)
-    if value_unit_at_S0 == 0:
+from plot_grid import N_PLOT, price_grid
+from uniswap_math import uniswap_lp_constants, uniswap_v3_value_unit_sorted
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+@st.cache_data
+def lp_value_curve(K, r, alpha, price_min, price_max, n_points=N_PLOT):
+    S_values = price_grid(price_min, price_max, n_points, kinks=(K / r, K * r))
+    lp_values = uniswap_v3_value_unit_sorted(S_values, K, r)
+    lp_values *= alpha
+    return S_values, lp_values
+
+def plot_uniswap_v3_lp_value(S0, t_L, t_H, V0, price_min, price_max):
+    K, r, alpha = uniswap_lp_constants(S0, t_L, t_H, V0)
+    if alpha == 0:
         st.error("The 'unit' value at S0 is 0, cannot scale properly. Check your bounds vs. S0.")
         return
 
-    alpha = V0 / value_unit_at_S0
-
-    price_min = st.sidebar.number_input(
-        "Min Token Price (USD)",
-        key="uni_price_min",
-        min_value=0.0,
-        value=500.0,
-        step=1.0
-    )
-    price_max = st.sidebar.number_input(
-        "Max Token Price (USD)",
-        key="uni_price_max",
-        min_value=0.01,
-        value=4000.0,
-        step=1.0
-    )
-
     if price_min >= price_max:
         st.error("Min Token Price must be strictly less than Max Token Price.")
         return
 
-    S_values = np.linspace(price_min, price_max, 200)
-    lp_values = [alpha * uniswap_v3_value_unit(S, K, r) for S in S_values]
+    S_values, lp_values = lp_value_curve(K, r, alpha, price_min, price_max)
 
     fig, ax = plt.subplots(figsize=(8, 5))
     ax.plot(S_values, lp_values, label='LP Value', color='blue')
@@ -56,6 +37,7 @@ def plot_uniswap_v3_lp_value(S0, t_L, t_H, V0):
     ax.grid(True)
 
     st.pyplot(fig)
+    plt.close(fig)
 
 def main():
     st.title("Uniswap V3 LP Value")
@@ -65,42 +47,60 @@ def main():
     as the price of token A (in USD) varies.
     """)
 
-    st.sidebar.header("Input Parameters")
-
-    S0 = st.sidebar.number_input(
-        "Starting Price (S0) of Token A in USD",
-        key="uni_S0",
-        min_value=0.0001,
-        value=2000.0,
-        step=1.0
-    )
-    t_L = st.sidebar.number_input(
-        "Lower Bound (t_L)",
-        key="uni_tL",
-        min_value=0.0001,
-        value=1700.0,
-        step=1.0
-    )
-    t_H = st.sidebar.number_input(
-        "Upper Bound (t_H)",
-        key="uni_tH",
-        min_value=0.0001,
-        value=2700.0,
-        step=1.0
-    )
-    V0 = st.sidebar.number_input(
-        "LP Total Value (V0) in USD at S0",
-        key="uni_V0",
-        min_value=1.0,
-        value=3456.0,
-        step=1.0
-    )
+    with st.sidebar.form("uni_inputs"):
+        st.header("Input Parameters")
+
+        S0 = st.number_input(
+            "Starting Price (S0) of Token A in USD",
+            key="uni_S0",
+            min_value=0.0001,
+            value=2000.0,
+            step=1.0
+        )
+        t_L = st.number_input(
+            "Lower Bound (t_L)",
+            key="uni_tL",
+            min_value=0.0001,
+            value=1700.0,
+            step=1.0
+        )
+        t_H = st.number_input(
+            "Upper Bound (t_H)",
+            key="uni_tH",
+            min_value=0.0001,
+            value=2700.0,
+            step=1.0
+        )
+        V0 = st.number_input(
+            "LP Total Value (V0) in USD at S0",
+            key="uni_V0",
+            min_value=1.0,
+            value=3456.0,
+            step=1.0
+        )
+
+        price_min = st.number_input(
+            "Min Token Price (USD)",
+            key="uni_price_min",
+            min_value=0.0,
+            value=500.0,
+            step=1.0
+        )
+        price_max = st.number_input(
+            "Max Token Price (USD)",
+            key="uni_price_max",
+            min_value=0.01,
+            value=4000.0,
+            step=1.0
+        )
+
+        st.form_submit_button("Update")
 
     if t_L >= t_H:
         st.error("Lower bound (t_L) must be strictly less than upper bound (t_H).")
         return
 
-    plot_uniswap_v3_lp_value(S0, t_L, t_H, V0)
+    plot_uniswap_v3_lp_value(S0, t_L, t_H, V0, price_min, price_max)
 
 if __name__ == "__main__":
     main()
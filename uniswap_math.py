@@ -0,0 +1,44 @@
+import numpy as np
+import math
+
+###############################################################################
+# Uniswap V3 LP value math shared by uniswap_app.py and lp_plus_put_app.py
+###############################################################################
+def _in_range_value_unit(S, K, r, out):
+    np.sqrt(S, out=out)
+    out *= 2.0 * math.sqrt(K * r)
+    out -= S
+    out -= K
+    out *= 1.0 / (r - 1.0)
+    return out
+
+def uniswap_v3_value_unit(S, K, r):
+    if S < (K / r):
+        return S
+    elif S > (K * r):
+        return K
+    else:
+        return (2.0 * math.sqrt(S * K * r) - S - K) / (r - 1.0)
+
+def uniswap_v3_value_unit_sorted(S_sorted, K, r):
+    if r <= 1.0:
+        raise ValueError("uniswap_v3_value_unit_sorted needs t_L < t_H (r > 1).")
+    i = np.searchsorted(S_sorted, K / r, side="left")
+    j = np.searchsorted(S_sorted, K * r, side="right")
+    value = np.empty_like(S_sorted)
+    value[:i] = S_sorted[:i]
+    _in_range_value_unit(S_sorted[i:j], K, r, value[i:j])
+    value[j:] = K
+    return value
+
+def uniswap_lp_constants(S0, t_L, t_H, V0):
+    K = math.sqrt(t_L * t_H)
+    r = math.sqrt(t_H / t_L)
+    value_unit_at_S0 = uniswap_v3_value_unit(S0, K, r)
+    if value_unit_at_S0 == 0:
+        return K, r, 0.0
+    alpha = V0 / value_unit_at_S0
+    return K, r, alpha
+
+def uniswap_lp_value(S, K, r, alpha):
+    return alpha * uniswap_v3_value_unit(S, K, r)